@@ -1,9 +1,16 @@
+import hashlib
+import hmac
 import os
 import shutil
+import threading
 import uuid
+from typing import Optional
 
+import aiofiles
 import httpx
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Header, HTTPException, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from policymind.dependencies.container import AppContainer
 from policymind.models.schemas import (
@@ -17,6 +24,15 @@ from policymind.models.schemas import (
 
 router = APIRouter()
 
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# auto_error=False keeps a missing header a 401 instead of HTTPBearer's default 403.
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# Striped per-namespace locks: concurrent submissions of one document in this worker
+# index it once, without keeping a lock per document ever seen.
+_INDEXING_LOCKS = [threading.Lock() for _ in range(64)]
+
 
 def get_container() -> AppContainer:
     # Import inside dependency to avoid circular app imports.
@@ -25,17 +41,41 @@ def get_container() -> AppContainer:
     return get_container_from_app()
 
 
-async def process_and_cleanup_document(
-    file_path: str, document_id: str, container: AppContainer
+def verify_hackrx_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    container: AppContainer = Depends(get_container),
 ) -> None:
+    expected_token = container.settings.HACKRX_TOKEN.encode()
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), expected_token):
+        raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+def process_and_cleanup_document(file_path: str, document_id: str, container: AppContainer) -> None:
+    # Deliberately sync: background tasks declared with ``def`` run in the threadpool,
+    # keeping parsing, OCR and upserts off the event loop.
     try:
         result = container.document_processor.process_document(file_path, document_id)
-        container.vector_store.add_documents(result["chunks"])
+        container.vector_store.add_documents(result["chunks"], result["shared_metadata"])
     finally:
         if os.path.exists(file_path):
             os.remove(file_path)
 
 
+def index_submission_document(file_path: str, namespace: str, container: AppContainer) -> None:
+    with _INDEXING_LOCKS[hash(namespace) % len(_INDEXING_LOCKS)]:
+        # Re-checked under the lock: a concurrent submission may have just finished.
+        if container.vector_store.is_namespace_indexed(namespace):
+            return
+        doc_data = container.document_processor.process_document(file_path, namespace)
+        container.vector_store.add_documents(
+            doc_data["chunks"], doc_data["shared_metadata"], namespace=namespace
+        )
+        # Only a complete namespace gets its marker. A failed run is not cleaned up,
+        # since that could wipe a namespace another worker is filling; record ids are
+        # derived from the content, so the next run overwrites the partial records.
+        container.vector_store.mark_namespace_indexed(namespace)
+
+
 @router.get("/", summary="Root endpoint")
 async def root() -> dict[str, str]:
     return {"message": "PolicyMind API"}
@@ -58,7 +98,7 @@ async def upload_document(
     document_id = f"{uuid.uuid4()}{ext}"
     temp_path = os.path.join(settings.UPLOAD_DIR, document_id)
     with open(temp_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+        await run_in_threadpool(shutil.copyfileobj, file.file, buffer)
     background_tasks.add_task(process_and_cleanup_document, temp_path, document_id, container)
     return UploadResponse(
         success=True,
@@ -77,53 +117,44 @@ async def query_documents(
     return await container.query_engine.process_query(request)
 
 
-@router.post("/hackrx/run", response_model=SubmissionResponse, summary="Run a submission for hackathon")
+@router.post(
+    "/hackrx/run",
+    response_model=SubmissionResponse,
+    summary="Run a submission for hackathon",
+    dependencies=[Depends(verify_hackrx_token)],
+)
 async def run_submission(
-    request: SubmissionRequest,
-    authorization: str = Header(None),
-    container: AppContainer = Depends(get_container),
+    request: SubmissionRequest, container: AppContainer = Depends(get_container)
 ) -> SubmissionResponse:
     settings = container.settings
-    if not authorization or authorization.split(" ")[-1] != settings.HACKRX_TOKEN:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-
-    temp_file_path = None
-    temp_doc_id = f"hackathon-{uuid.uuid4()}.pdf"
+    temp_file_path = os.path.join(settings.UPLOAD_DIR, f"hackathon-{uuid.uuid4()}.pdf")
     try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            )
-        }
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                request.documents, headers=headers, follow_redirects=True, timeout=60.0
-            )
+        content_hash = hashlib.blake2b(digest_size=16)
+        async with container.http_client.stream("GET", request.documents) as response:
             response.raise_for_status()
-            file_content = response.content
-
-        temp_file_path = os.path.join(settings.UPLOAD_DIR, temp_doc_id)
-        with open(temp_file_path, "wb") as file_handle:
-            file_handle.write(file_content)
-
-        doc_data = container.document_processor.process_document(temp_file_path, temp_doc_id)
-        container.vector_store.add_documents(doc_data["chunks"])
-
-        answers = []
-        for question in request.questions:
-            query_request = QueryRequest(
-                question=question, document_ids=[temp_doc_id], include_logic=False
-            )
-            query_result = await container.query_engine.process_query(query_request)
-            answers.append(query_result.answer)
-        return SubmissionResponse(answers=answers)
+            async with aiofiles.open(temp_file_path, "wb") as file_handle:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    content_hash.update(chunk)
+                    await file_handle.write(chunk)
+
+        # Each document gets its own content-addressed namespace: searches are scoped
+        # without a metadata filter, the shared corpus is untouched, and re-submitting
+        # the same document reuses its vectors (and cached answers) instead of
+        # processing and indexing it again.
+        namespace = f"hackathon-{content_hash.hexdigest()}"
+        if not await run_in_threadpool(container.vector_store.is_namespace_indexed, namespace):
+            await run_in_threadpool(index_submission_document, temp_file_path, namespace, container)
+
+        query_results = await container.query_engine.process_queries(
+            [QueryRequest(question=question, include_logic=False) for question in request.questions],
+            namespace=namespace,
+        )
+        return SubmissionResponse(answers=[query_result.answer for query_result in query_results])
     except httpx.RequestError as exc:
         raise HTTPException(status_code=400, detail=f"Failed to download document: {exc}") from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"An error occurred during processing: {exc}") from exc
     finally:
-        container.vector_store.delete_documents(document_ids=[temp_doc_id])
-        if temp_file_path and os.path.exists(temp_file_path):
+        if os.path.exists(temp_file_path):
             os.remove(temp_file_path)
 
@@ -1,9 +1,13 @@
+import asyncio
 import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from policymind.api.routes import router
+from policymind.core.config import get_settings
+from policymind.core.logging import setup_logging
 from policymind.dependencies.container import AppContainer, build_container
 
 
@@ -17,7 +21,7 @@ def get_container_from_app() -> AppContainer:
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="PolicyMind API")
+    app = FastAPI(title="PolicyMind API", default_response_class=ORJSONResponse)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -29,10 +33,21 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def startup_event() -> None:
         global _container
+        # uvicorn workers are fresh spawned processes, so logging configured by
+        # policymind.main in the parent does not carry over; set it up per worker.
+        setup_logging(get_settings().LOG_LEVEL)
         _container = build_container()
         os.makedirs(_container.settings.UPLOAD_DIR, exist_ok=True)
         if _container.settings.VECTOR_DB_TYPE == "faiss":
             os.makedirs(_container.settings.VECTOR_STORE_DIR, exist_ok=True)
+        if _container.settings.VECTOR_STORE_WARMUP:
+            await asyncio.to_thread(_container.vector_store.warmup)
+
+    @app.on_event("shutdown")
+    async def shutdown_event() -> None:
+        if _container is not None:
+            await _container.http_client.aclose()
+            _container.document_processor.close()
 
     app.include_router(router)
     return app
@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import List
 
@@ -5,6 +6,13 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Output dimensions accepted by Pinecone-hosted embedding models. Integrated indexes
+# store float32 vectors only, so the dimension is the lever on bytes per vector.
+PINECONE_MODEL_DIMENSIONS = {
+    "llama-text-embed-v2": {384, 512, 768, 1024, 2048},
+    "multilingual-e5-large": {1024},
+}
+
 
 class Settings:
     """Centralized runtime settings with validation and defaults."""
@@ -15,6 +23,7 @@ class Settings:
         self.OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         self.GEMINI_API_KEY: str | None = os.getenv("GEMINI_API_KEY")
         self.GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+        self.LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
 
         self.VECTOR_DB_TYPE: str = os.getenv("VECTOR_DB_TYPE", "pinecone").lower()
         self.PINECONE_API_KEY: str | None = os.getenv("PINECONE_API_KEY")
@@ -22,19 +31,43 @@ class Settings:
         self.PINECONE_EMBEDDING_MODEL: str = os.getenv(
             "PINECONE_EMBEDDING_MODEL", "llama-text-embed-v2"
         )
+        self.UPSERT_BATCH_SIZE: int = int(os.getenv("UPSERT_BATCH_SIZE", "96"))
+        self.UPSERT_THREADS: int = int(os.getenv("UPSERT_THREADS", "8"))
+        self.PINECONE_METRIC: str = os.getenv("PINECONE_METRIC", "cosine").lower()
+        embedding_dimension = os.getenv("PINECONE_EMBEDDING_DIMENSION")
+        self.PINECONE_EMBEDDING_DIMENSION: int | None = (
+            int(embedding_dimension) if embedding_dimension else None
+        )
         self.EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 
         self.CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
         self.CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
         self.TOP_K_RESULTS: int = int(os.getenv("TOP_K_RESULTS", "5"))
         self.SIMILARITY_THRESHOLD: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.5"))
+        self.QUERY_CACHE_MAX_SIZE: int = int(os.getenv("QUERY_CACHE_MAX_SIZE", "10000"))
+        self.QUERY_CACHE_TTL_SECONDS: int = int(os.getenv("QUERY_CACHE_TTL_SECONDS", "1800"))
+        self.SEARCH_CACHE_MAX_SIZE: int = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "1024"))
+        self.SEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+        self.CACHE_WRITE_SETTLE_SECONDS: float = float(os.getenv("CACHE_WRITE_SETTLE_SECONDS", "10"))
+        self.BATCH_SEARCH_THREADS: int = int(os.getenv("BATCH_SEARCH_THREADS", "8"))
+        self.VECTOR_STORE_WARMUP: bool = os.getenv("VECTOR_STORE_WARMUP", "true").lower() == "true"
+        # urllib3 connections the Pinecone client keeps per host; the SDK default is
+        # 5 per CPU, which a small container's upsert or batch-search fan-out exceeds.
+        self.PINECONE_CONNECTION_POOL_SIZE: int = int(
+            os.getenv("PINECONE_CONNECTION_POOL_SIZE", str(max(self.UPSERT_THREADS, self.BATCH_SEARCH_THREADS)))
+        )
 
         self.SUPPORTED_FORMATS: List[str] = [".pdf", ".docx", ".txt", ".pptx"]
         self.MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "50"))
+        # OCR processes per API worker. The pool stays empty until a scanned PDF
+        # arrives, so each worker can be sized to the whole machine.
+        self.OCR_WORKERS: int = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
 
         self.API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
         self.API_PORT: int = int(os.getenv("API_PORT", "8000"))
+        self.API_WORKERS: int = int(os.getenv("API_WORKERS", str(max(2, os.cpu_count() or 1))))
         self.UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "uploads")
+        self.CACHE_STATE_DIR: str = os.getenv("CACHE_STATE_DIR", os.path.join(self.UPLOAD_DIR, ".cache-state"))
         self.VECTOR_STORE_DIR: str = os.getenv("VECTOR_STORE_DIR", "vector_store")
         self.LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
         self.HACKRX_TOKEN: str = os.getenv(
@@ -62,3 +95,33 @@ class Settings:
                 "VECTOR_DB_TYPE is 'pinecone', but PINECONE_EMBEDDING_MODEL is missing."
             )
 
+        if not 1 <= self.UPSERT_BATCH_SIZE <= 96:
+            raise ValueError("UPSERT_BATCH_SIZE must be between 1 and 96 for integrated-embedding upserts.")
+
+        if self.PINECONE_METRIC not in {"cosine", "dotproduct", "euclidean"}:
+            raise ValueError(f"Unsupported PINECONE_METRIC: '{self.PINECONE_METRIC}'.")
+
+        if self.PINECONE_CONNECTION_POOL_SIZE < max(self.UPSERT_THREADS, self.BATCH_SEARCH_THREADS):
+            raise ValueError(
+                "PINECONE_CONNECTION_POOL_SIZE must be at least UPSERT_THREADS and BATCH_SEARCH_THREADS."
+            )
+
+        if self.OCR_WORKERS < 1:
+            raise ValueError("OCR_WORKERS must be at least 1.")
+
+        supported_dimensions = PINECONE_MODEL_DIMENSIONS.get(self.PINECONE_EMBEDDING_MODEL)
+        if (
+            self.PINECONE_EMBEDDING_DIMENSION is not None
+            and supported_dimensions is not None
+            and self.PINECONE_EMBEDDING_DIMENSION not in supported_dimensions
+        ):
+            raise ValueError(
+                f"PINECONE_EMBEDDING_DIMENSION must be one of {sorted(supported_dimensions)} "
+                f"for '{self.PINECONE_EMBEDDING_MODEL}'."
+            )
+
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide settings, parsed and validated once."""
+    return Settings()
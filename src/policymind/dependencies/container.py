@@ -1,7 +1,9 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from policymind.core.config import Settings
+import httpx
+
+from policymind.core.config import Settings, get_settings
 
 if TYPE_CHECKING:
     from policymind.services.document_processor import DocumentProcessor
@@ -17,6 +19,24 @@ class AppContainer:
     vector_store: "VectorStore"
     llm_provider: "LLMProvider"
     query_engine: "QueryEngine"
+    http_client: httpx.AsyncClient
+
+
+def build_http_client() -> httpx.AsyncClient:
+    # Shared across requests so repeat downloads from the same host reuse pooled
+    # keep-alive connections instead of paying a fresh TCP + TLS handshake.
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0),
+        timeout=httpx.Timeout(connect=5.0, read=55.0, write=10.0, pool=5.0),
+        headers={
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+            )
+        },
+        follow_redirects=True,
+    )
 
 
 def build_container() -> AppContainer:
@@ -25,7 +45,7 @@ def build_container() -> AppContainer:
     from policymind.services.query_engine import QueryEngine
     from policymind.services.vector_store import VectorStore
 
-    settings = Settings()
+    settings = get_settings()
     vector_store = VectorStore(settings)
     llm_provider = get_llm_provider(settings)
     document_processor = DocumentProcessor(settings)
@@ -36,5 +56,6 @@ def build_container() -> AppContainer:
         vector_store=vector_store,
         llm_provider=llm_provider,
         query_engine=query_engine,
+        http_client=build_http_client(),
     )
 
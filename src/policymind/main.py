@@ -1,16 +1,16 @@
+import importlib.util
 import logging
 import sys
 
 import uvicorn
 
-from policymind.app import app
-from policymind.core.config import Settings
+from policymind.core.config import get_settings
 from policymind.core.logging import setup_logging
 
 
 def main() -> None:
     try:
-        settings = Settings()
+        settings = get_settings()
         setup_logging(settings.LOG_LEVEL)
         logger = logging.getLogger(__name__)
         logger.info("Starting PolicyMind...")
@@ -22,11 +22,17 @@ def main() -> None:
         else:
             logger.info("Embedding Model    : %s (Self-Hosted)", settings.EMBEDDING_MODEL)
         logger.info("API Server listening on http://%s:%s", settings.API_HOST, settings.API_PORT)
+        logger.info("Workers            : %s", settings.API_WORKERS)
         logger.info("=" * 50)
+        # An import string is required for multiple workers; each worker process then
+        # builds its own container in the startup hook.
         uvicorn.run(
-            app,
+            "policymind.app:app",
             host=settings.API_HOST,
             port=settings.API_PORT,
+            workers=settings.API_WORKERS,
+            loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+            http="httptools" if importlib.util.find_spec("httptools") else "h11",
             log_level=settings.LOG_LEVEL.lower(),
             access_log=True,
         )
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, List, Optional, Union
 
@@ -83,7 +84,10 @@ class DocumentMetadata(BaseModel):
     company_name: Optional[str] = None
 
 
-class SearchResult(BaseModel):
+@dataclass(slots=True)
+class SearchResult:
+    # Internal only (never validated or serialized), and built once per hit, so a
+    # slotted dataclass instead of a pydantic model.
     content: str
     metadata: Dict[str, Any]
     score: float
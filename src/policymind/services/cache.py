@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from cachetools import TTLCache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query_text(text: str) -> str:
+    # Case and spacing barely move the query embedding, so variants that differ only
+    # in those share cache entries. Punctuation is kept: "10/20" and "10-20" differ.
+    return _WHITESPACE_RE.sub(" ", text.lower()).strip()
+
+
+class _EvictionCountingTTLCache(TTLCache):
+    """TTLCache that counts entries evicted to make room (expired entries are not counted)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evictions = 0
+
+    def popitem(self) -> Any:
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def clear(self) -> None:
+        # MutableMapping.clear() pops items one by one; dropping them is not an eviction.
+        evictions = self.evictions
+        super().clear()
+        self.evictions = evictions
+
+
+class QueryCache:
+    """Thread-safe LRU cache with a per-entry TTL and hit/miss/eviction counters."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._entries = _EvictionCountingTTLCache(maxsize=max_size, ttl=ttl_seconds)
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, version: Optional[int] = None) -> Optional[Any]:
+        """Return the value cached under ``key`` if it was stored with ``version``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] != version:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        with self._lock:
+            self._entries[key] = (version, value)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._entries.evictions,
+                "size": len(self._entries),
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class NamespaceVersions:
+    """Last-write stamps per namespace, shared by every worker process on the host.
+
+    Each stamp is the mtime (ns) of a marker file, so a write in one uvicorn worker
+    invalidates what the others cached for that namespace.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, namespace: str) -> int:
+        try:
+            return os.stat(self._path(namespace)).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def bump(self, namespace: str) -> None:
+        path = self._path(namespace)
+        with open(path, "a"):
+            pass
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    def _path(self, namespace: str) -> str:
+        return os.path.join(self._directory, hashlib.sha1(namespace.encode()).hexdigest())
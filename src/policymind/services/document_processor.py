@@ -1,24 +1,21 @@
+import multiprocessing
 import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+import fitz
+import numpy as np
 from docx import Document
 from nltk.tokenize import sent_tokenize
-from pdf2image import convert_from_path
 from pptx import Presentation
-import pytesseract
 
 from policymind.core.config import Settings
 from policymind.models.schemas import DocumentMetadata, DocumentType
 
-try:
-    import fitz
-
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
-
 try:
     import nltk
 
@@ -30,24 +27,57 @@ except (ImportError, LookupError, OSError):
     nltk.download("punkt", quiet=True)
     nltk.download("punkt_tab", quiet=True)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+# PyMuPDF's default text flags minus ligature/whitespace preservation: whitespace is
+# collapsed by _clean_text anyway, and expanded ligatures ("fi", not U+FB01) match
+# query text.
+_PDF_TEXT_FLAGS = fitz.TEXT_MEDIABOX_CLIP | fitz.TEXT_CID_FOR_UNKNOWN_UNICODE
+
+
+def _ocr_pdf_pages(file_path: str, page_numbers: List[int]) -> List[str]:
+    # Runs in a worker process: PyMuPDF documents cannot be shared across threads,
+    # so each worker opens its own handle and OCRs a contiguous range of pages.
+    tessdata = fitz.get_tessdata()
+    if not tessdata:
+        raise RuntimeError("Tesseract-OCR language data not found; install Tesseract or set TESSDATA_PREFIX.")
+    with fitz.open(file_path) as doc:
+        return [
+            doc[page_number]
+            .get_textpage_ocr(language="eng", dpi=200, full=True, tessdata=tessdata)
+            .extractText()
+            for page_number in page_numbers
+        ]
+
 
 class DocumentProcessor:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.chunk_size = settings.CHUNK_SIZE
         self.chunk_overlap = settings.CHUNK_OVERLAP
+        # Workers are only spawned once a scanned PDF arrives. "spawn" avoids forking
+        # a process that already runs server and thread-pool threads.
+        self._ocr_workers = settings.OCR_WORKERS
+        self._ocr_pool = self._new_ocr_pool()
+        self._ocr_pool_lock = threading.Lock()
+
+    def close(self) -> None:
+        self._ocr_pool.shutdown(wait=False)
+
+    def _new_ocr_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self._ocr_workers, mp_context=multiprocessing.get_context("spawn"))
 
     def process_document(self, file_path: str, document_id: str) -> Dict[str, Any]:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Document not found at path: {file_path}")
 
         text_content, metadata = self._extract_text_and_metadata(file_path, document_id)
-        chunks = self._create_chunks(text_content, metadata)
+        # Chunks are produced lazily so the vector store can upload early batches
+        # while later ones are still being packed.
         return {
             "document_id": document_id,
-            "chunks": chunks,
+            "shared_metadata": self._create_shared_metadata(metadata),
+            "chunks": self._create_chunks(text_content, metadata),
             "metadata": metadata,
-            "total_chunks": len(chunks),
         }
 
     def _extract_text_and_metadata(self, file_path: str, document_id: str) -> tuple[str, DocumentMetadata]:
@@ -70,27 +100,45 @@ class DocumentProcessor:
         text = ""
         page_count = 0
 
-        if PYMUPDF_AVAILABLE:
-            try:
-                with fitz.open(file_path) as doc:
-                    page_count = len(doc)
-                    text = " ".join(page.get_text() for page in doc).strip()
-                if len(text) > 100:
-                    return text, page_count
-            except Exception:
-                pass
-
-        images = convert_from_path(file_path)
-        page_count = len(images)
-        ocr_text_parts = [pytesseract.image_to_string(image) for image in images]
-        text = " ".join(ocr_text_parts).strip()
+        try:
+            with fitz.open(file_path) as doc:
+                page_count = len(doc)
+                text = " ".join([page.get_text("text", flags=_PDF_TEXT_FLAGS) for page in doc]).strip()
+            if len(text) > 100:
+                return text, page_count
+        except Exception:
+            pass
+
+        # Scanned PDF: OCR in-process through MuPDF's Tesseract integration, which
+        # skips rasterizing pages to image files and spawning tesseract per page.
+        text = " ".join(self._ocr_pages(file_path, page_count)).strip()
         if not text:
             raise RuntimeError(f"All PDF processing methods failed for file: {os.path.basename(file_path)}")
         return text, page_count
 
+    def _ocr_pages(self, file_path: str, page_count: int) -> List[str]:
+        pages_per_worker = max(1, -(-page_count // self._ocr_workers))
+        page_ranges = [
+            list(range(first_page, min(first_page + pages_per_worker, page_count)))
+            for first_page in range(0, page_count, pages_per_worker)
+        ]
+        pool = self._ocr_pool
+        try:
+            ocr_results = list(pool.map(_ocr_pdf_pages, [file_path] * len(page_ranges), page_ranges))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed) and the executor refuses all further work;
+            # replace it once, unless a concurrent request already has, and retry.
+            with self._ocr_pool_lock:
+                if self._ocr_pool is pool:
+                    pool.shutdown(wait=False)
+                    self._ocr_pool = self._new_ocr_pool()
+                pool = self._ocr_pool
+            ocr_results = list(pool.map(_ocr_pdf_pages, [file_path] * len(page_ranges), page_ranges))
+        return [page_text for page_texts in ocr_results for page_text in page_texts]
+
     def _process_docx(self, file_path: str) -> tuple[str, Optional[int]]:
         doc = Document(file_path)
-        return "\n".join(p.text for p in doc.paragraphs if p.text), None
+        return "\n".join([p.text for p in doc.paragraphs if p.text]), None
 
     def _process_txt(self, file_path: str) -> tuple[str, Optional[int]]:
         with open(file_path, "r", encoding="utf-8", errors="ignore") as handle:
@@ -99,10 +147,12 @@ class DocumentProcessor:
     def _process_pptx(self, file_path: str) -> tuple[str, int]:
         prs = Presentation(file_path)
         text = "\n".join(
-            shape.text
-            for slide in prs.slides
-            for shape in slide.shapes
-            if hasattr(shape, "text") and shape.text
+            [
+                shape.text
+                for slide in prs.slides
+                for shape in slide.shapes
+                if getattr(shape, "text", None)
+            ]
         )
         return text, len(prs.slides)
 
@@ -118,62 +168,61 @@ class DocumentProcessor:
             company_name=self._extract_company_name(text),
         )
 
-    def _create_chunks(self, text: str, metadata: DocumentMetadata) -> List[Dict[str, Any]]:
+    def _create_chunks(self, text: str, metadata: DocumentMetadata) -> Iterator[Dict[str, Any]]:
         if not text:
-            return []
-
-        sentences = sent_tokenize(text)
-        chunks: List[Dict[str, Any]] = []
-        current_chunk_sentences: List[str] = []
-        current_length = 0
-        chunk_id = 0
-
-        for sentence in sentences:
-            sentence_length = len(sentence)
-            if current_length + sentence_length > self.chunk_size and current_chunk_sentences:
-                chunk_text = " ".join(current_chunk_sentences)
-                chunks.append(self._create_chunk_dict(chunk_text, chunk_id, metadata))
-                chunk_id += 1
-
-                overlap_sentences: List[str] = []
-                overlap_len = 0
-                for existing in reversed(current_chunk_sentences):
-                    if overlap_len + len(existing) < self.chunk_overlap:
-                        overlap_sentences.insert(0, existing)
-                        overlap_len += len(existing)
-                    else:
-                        break
-
-                current_chunk_sentences = overlap_sentences + [sentence]
-                current_length = overlap_len + sentence_length
-            else:
-                current_chunk_sentences.append(sentence)
-                current_length += sentence_length
-
-        if current_chunk_sentences:
-            chunk_text = " ".join(current_chunk_sentences)
-            chunks.append(self._create_chunk_dict(chunk_text, chunk_id, metadata))
-
-        return chunks
-
-    def _create_chunk_dict(
-        self, text: str, chunk_id: int, metadata: DocumentMetadata
-    ) -> Dict[str, Any]:
-        chunk_data: Dict[str, Any] = {
-            "id": f"{metadata.document_id}_{chunk_id}",
-            "chunk_text": text,
+            return
+
+        for chunk_id, chunk_text in enumerate(self._group_sentences(sent_tokenize(text))):
+            yield self._create_chunk_dict(chunk_text, chunk_id, metadata.document_id)
+
+    def _group_sentences(self, sentences: List[str]) -> Iterator[str]:
+        """Greedily pack sentences into ~chunk_size chunks, carrying trailing sentences as overlap."""
+        if not sentences:
+            return
+
+        chunk_size = self.chunk_size
+        chunk_overlap = self.chunk_overlap
+        total = len(sentences)
+        # offsets[i] is the combined length of sentences[:i], so any run of sentences
+        # can be measured and bounded with a binary search instead of a Python loop.
+        offsets = np.zeros(total + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, sentences), dtype=np.int64, count=total), out=offsets[1:])
+
+        start = 0
+        first_new = 0
+        while True:
+            # The first sentence that would overflow the chunk closes it, but every
+            # chunk keeps at least one sentence not carried over from the last one.
+            end = int(np.searchsorted(offsets, offsets[start] + chunk_size, side="right")) - 1
+            end = max(end, first_new + 1)
+            if end >= total:
+                yield " ".join(sentences[start:])
+                return
+
+            yield " ".join(sentences[start:end])
+            # Overlap is the longest run of trailing sentences shorter than chunk_overlap.
+            overlap_start = int(np.searchsorted(offsets, offsets[end] - chunk_overlap, side="right"))
+            start = min(max(overlap_start, start), end)
+            first_new = end
+
+    def _create_chunk_dict(self, text: str, chunk_id: int, document_id: str) -> Dict[str, Any]:
+        # Document-level fields live once in the shared metadata and are merged into
+        # each record only when it is upserted.
+        return {"id": f"{document_id}_{chunk_id}", "chunk_text": text, "chunk_id": chunk_id}
+
+    def _create_shared_metadata(self, metadata: DocumentMetadata) -> Dict[str, Any]:
+        shared_metadata: Dict[str, Any] = {
             "document_id": metadata.document_id,
-            "chunk_id": chunk_id,
             "document_type": metadata.document_type.value,
         }
         if metadata.company_name:
-            chunk_data["company_name"] = metadata.company_name
+            shared_metadata["company_name"] = metadata.company_name
         if metadata.page_count is not None:
-            chunk_data["page_count"] = metadata.page_count
-        return chunk_data
+            shared_metadata["page_count"] = metadata.page_count
+        return shared_metadata
 
     def _clean_text(self, text: str) -> str:
-        return re.sub(r"\s+", " ", text).strip()
+        return _WHITESPACE_RE.sub(" ", text).strip()
 
     def _detect_document_type(self, text: str) -> DocumentType:
         return DocumentType.UNKNOWN
@@ -1,8 +1,8 @@
-import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 
 import google.generativeai as genai
+import orjson
 from openai import AsyncOpenAI
 
 from policymind.core.config import Settings
@@ -32,7 +32,7 @@ class GeminiProvider(LLMProvider):
         json_prompt = f"Follow these instructions: {prompt}. Output a valid JSON object only."
         config = genai.types.GenerationConfig(response_mime_type="application/json")
         response = await self.model_instance.generate_content_async(json_prompt, generation_config=config)
-        return json.loads(response.text)
+        return orjson.loads(response.text)
 
 
 class OpenAIProvider(LLMProvider):
@@ -56,7 +56,7 @@ class OpenAIProvider(LLMProvider):
                 {"role": "user", "content": prompt},
             ],
         )
-        return json.loads(response.choices[0].message.content or "{}")
+        return orjson.loads(response.choices[0].message.content or "{}")
 
 
 def get_llm_provider(settings: Settings) -> LLMProvider:
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import re
 import time
@@ -13,49 +14,160 @@ from policymind.models.schemas import (
     QueryResponse,
     SearchResult,
 )
+from policymind.services.cache import QueryCache, normalize_query_text
 from policymind.services.llm_providers import LLMProvider
-from policymind.services.vector_store import VectorStore
+from policymind.services.vector_store import DEFAULT_NAMESPACE, VectorStore
 
 logger = logging.getLogger(__name__)
 
+_CONFIDENCE_RE = re.compile(r"Confidence:\s*([0-9]*\.?[0-9]+)", re.IGNORECASE)
+# Intent/entity extraction is not implemented yet; every answer reports these.
+DEFAULT_QUERY_INTENT = "General Inquiry"
+
+
 class QueryEngine:
     def __init__(self, settings: Settings, vector_store: VectorStore, llm_provider: LLMProvider):
         self.settings = settings
         self.vector_store = vector_store
         self.llm_provider = llm_provider
 
-    async def process_query(self, request: QueryRequest) -> QueryResponse:
-        search_results = self.vector_store.search(
-            query=request.question,
-            top_k=request.max_results,
-            document_ids=request.document_ids,
-        )
-        filtered_results = [
-            result for result in search_results if result.score >= self.settings.SIMILARITY_THRESHOLD
+        # A repeated question skips the LLM entirely; raw hits are cached by the vector store.
+        self._answer_cache = QueryCache(settings.QUERY_CACHE_MAX_SIZE, settings.QUERY_CACHE_TTL_SECONDS)
+        # Bounds in-flight LLM calls so concurrent questions stay within provider rate limits.
+        self._llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+    async def process_query(
+        self, request: QueryRequest, namespace: str = DEFAULT_NAMESPACE
+    ) -> QueryResponse:
+        return (await self.process_queries([request], namespace=namespace))[0]
+
+    async def process_queries(
+        self, requests: List[QueryRequest], namespace: str = DEFAULT_NAMESPACE
+    ) -> List[QueryResponse]:
+        """Answer several questions with one round of vector searches and one batched LLM call."""
+        # Answers follow the vector store's freshness rules: dropped when the namespace
+        # is written by any worker, and not cached right after a write.
+        cache_version = self.vector_store.cache_version(namespace)
+        answer_keys = [self._answer_cache_key(request, namespace) for request in requests]
+        responses: List[Optional[QueryResponse]] = [
+            self._answer_cache.get(answer_key, cache_version) if cache_version is not None else None
+            for answer_key in answer_keys
         ]
-        if not filtered_results:
-            return self._create_no_results_response()
-
-        clauses_used = self._create_clauses_from_search(filtered_results)
-        
-        start_time = time.time()
-        answer, confidence = await self._generate_final_answer(request.question, clauses_used)
-        
-        logic_tree: Optional[LogicTree] = None
-        if request.include_logic:
-            logic_tree = await self._generate_logic_tree_with_llm(request.question, clauses_used)
-            
-        logger.info(f"LLM Generation completed in {time.time() - start_time:.2f}s")
-        
-        intent, entities = self._extract_intent_and_entities(request.question)
-        return QueryResponse(
-            answer=answer,
-            clauses_used=clauses_used,
-            logic_tree=logic_tree,
-            confidence=confidence,
-            query_intent=intent,
-            entities=entities,
+
+        pending = [index for index, response in enumerate(responses) if response is None]
+        search_results = await self._search([requests[index] for index in pending], namespace)
+
+        answerable: List[Tuple[int, List[ClauseInfo]]] = []
+        for index, results in zip(pending, search_results):
+            filtered_results = [
+                result for result in results if result.score >= self.settings.SIMILARITY_THRESHOLD
+            ]
+            if not filtered_results:
+                responses[index] = self._create_no_results_response()
+            else:
+                answerable.append((index, self._create_clauses_from_search(filtered_results)))
+
+        if answerable:
+            start_time = time.time()
+            logic_indices = [index for index, _ in answerable if requests[index].include_logic]
+            answers, logic_trees = await asyncio.gather(
+                self._generate_final_answers(
+                    [(requests[index].question, clauses_used) for index, clauses_used in answerable]
+                ),
+                asyncio.gather(
+                    *[
+                        self._generate_logic_tree_with_llm(requests[index].question, clauses_used)
+                        for index, clauses_used in answerable
+                        if index in logic_indices
+                    ]
+                ),
+            )
+            logic_tree_by_index = dict(zip(logic_indices, logic_trees))
+            for (index, clauses_used), (answer, confidence) in zip(answerable, answers):
+                response = QueryResponse(
+                    answer=answer,
+                    clauses_used=clauses_used,
+                    logic_tree=logic_tree_by_index.get(index),
+                    confidence=confidence,
+                    query_intent=DEFAULT_QUERY_INTENT,
+                    entities={},
+                )
+                responses[index] = response
+                if cache_version is not None:
+                    self._answer_cache.set(answer_keys[index], response, cache_version)
+
+            logger.info(f"LLM Generation completed in {time.time() - start_time:.2f}s")
+
+        return [response for response in responses if response is not None]
+
+    def stats(self) -> Dict[str, float]:
+        return {f"answer_{name}": value for name, value in self._answer_cache.get_stats().items()}
+
+    def _answer_cache_key(self, request: QueryRequest, namespace: str) -> Tuple[Any, ...]:
+        return (
+            namespace,
+            normalize_query_text(request.question),
+            tuple(sorted(request.document_ids or ())),
+            request.max_results,
+            request.include_logic,
+        )
+
+    async def _search(
+        self, requests: List[QueryRequest], namespace: str
+    ) -> List[List[SearchResult]]:
+        # Questions sharing a document scope and top_k go to the vector store together,
+        # and the groups are searched concurrently; repeated questions are answered
+        # from the vector store's result cache.
+        groups: Dict[Tuple[Any, ...], List[int]] = {}
+        for index, request in enumerate(requests):
+            scope = (tuple(sorted(request.document_ids or ())), request.max_results)
+            groups.setdefault(scope, []).append(index)
+
+        group_indices = list(groups.values())
+        group_results = await asyncio.gather(
+            *[self._search_group([requests[index] for index in indices], namespace) for indices in group_indices]
         )
+        search_results: List[List[SearchResult]] = [[] for _ in requests]
+        for indices, batch_results in zip(group_indices, group_results):
+            for index, results in zip(indices, batch_results):
+                search_results[index] = results
+        return search_results
+
+    async def _search_group(
+        self, requests: List[QueryRequest], namespace: str
+    ) -> List[List[SearchResult]]:
+        first = requests[0]
+        if len(requests) == 1:
+            return [
+                await self.vector_store.asearch(
+                    query=first.question,
+                    top_k=first.max_results,
+                    document_ids=first.document_ids,
+                    namespace=namespace,
+                )
+            ]
+        return await self.vector_store.asearch_batch(
+            queries=[request.question for request in requests],
+            top_k=first.max_results,
+            document_ids=first.document_ids,
+            namespace=namespace,
+        )
+
+    async def _generate_final_answers(
+        self, items: List[Tuple[str, List[ClauseInfo]]]
+    ) -> List[Tuple[str, float]]:
+        if len(items) == 1:
+            question, clauses = items[0]
+            return [await self._generate_final_answer(question, clauses)]
+        try:
+            return await self._generate_batched_answers(items)
+        except Exception as e:
+            logger.error(f"Batched answer generation failed, answering individually: {e}")
+            return list(
+                await asyncio.gather(
+                    *[self._generate_final_answer(question, clauses) for question, clauses in items]
+                )
+            )
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def _generate_final_answer(self, question: str, clauses: List[ClauseInfo]) -> Tuple[str, float]:
@@ -79,12 +191,13 @@ class QueryEngine:
         3. If missing, respond exactly: "The provided documents do not contain a clear answer to this question."
         4. End with: Confidence: [score from 0.0 to 1.0]
         """
-        response_text = await self.llm_provider.generate_response(prompt)
-        confidence_match = re.search(r"Confidence:\s*([0-9]*\.?[0-9]+)", response_text, re.IGNORECASE)
+        async with self._llm_semaphore:
+            response_text = await self.llm_provider.generate_response(prompt)
+        confidence_match = _CONFIDENCE_RE.search(response_text)
         if confidence_match:
             try:
                 confidence = float(confidence_match.group(1))
-                answer = response_text.split(confidence_match.group(0))[0].strip()
+                answer = response_text[: confidence_match.start()].strip()
             except ValueError:
                 confidence = 0.5
                 answer = response_text.strip()
@@ -93,6 +206,36 @@ class QueryEngine:
             answer = response_text.strip()
         return answer, confidence
 
+    async def _generate_batched_answers(
+        self, items: List[Tuple[str, List[ClauseInfo]]]
+    ) -> List[Tuple[str, float]]:
+        sections = []
+        for number, (question, clauses) in enumerate(items, start=1):
+            context = "\n\n".join(
+                f"Source Clause ID: {clause.clause_id}\nClause Content:\n{clause.text}"
+                for clause in clauses
+            )
+            sections.append(f"**Question {number}:** {question}\n\n**Context for Question {number}:**\n---\n{context}\n---")
+        questions_block = "\n\n".join(sections)
+        prompt = f"""
+        You are a meticulous and precise Insurance Policy Analyst. Answer each numbered question based *only* on the context provided for that question.
+
+        {questions_block}
+
+        **Instructions:**
+        1. Analyze each context and extract concrete details.
+        2. Synthesize a direct answer per question using document evidence only.
+        3. If an answer is missing, use exactly: "The provided documents do not contain a clear answer to this question."
+        4. Output JSON: {{"answers":[{{"q":<question number>,"a":"<answer>","confidence":<score from 0.0 to 1.0>}}]}}
+        """
+        async with self._llm_semaphore:
+            structured_response = await self.llm_provider.generate_structured_response(prompt)
+        answers_by_number = {
+            int(entry["q"]): (str(entry["a"]).strip(), min(max(float(entry.get("confidence", 0.5)), 0.0), 1.0))
+            for entry in structured_response["answers"]
+        }
+        return [answers_by_number[number] for number in range(1, len(items) + 1)]
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def _generate_logic_tree_with_llm(
         self, question: str, clauses: List[ClauseInfo]
@@ -104,7 +247,8 @@ class QueryEngine:
             'Output JSON object matching: {"type":"AND | OR","conditions":[{"condition":"...","is_met":true,"source_clause_id":"..."}]}'
         )
         try:
-            structured_response = await self.llm_provider.generate_structured_response(prompt)
+            async with self._llm_semaphore:
+                structured_response = await self.llm_provider.generate_structured_response(prompt)
             return LogicTree.model_validate(structured_response)
         except Exception as e:
             logger.error(f"Logic tree generation failed: {e}")
@@ -123,9 +267,6 @@ class QueryEngine:
             for result in search_results
         ]
 
-    def _extract_intent_and_entities(self, question: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
-        return "General Inquiry", {}
-
     def _create_no_results_response(self) -> QueryResponse:
         return QueryResponse(
             answer="I could not find any relevant information in the documents to answer your question.",
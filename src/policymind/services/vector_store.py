@@ -1,71 +1,368 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from itertools import islice
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+import orjson
 from pinecone import Pinecone
+from tenacity import retry, stop_after_attempt, wait_exponential
 
 from policymind.core.config import Settings
 from policymind.models.schemas import SearchResult
+from policymind.services.cache import NamespaceVersions, QueryCache, normalize_query_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAMESPACE = "__default__"
+# Holds one completion marker per fully indexed namespace, keyed by namespace name.
+# Never searched, so markers cannot surface as hits.
+INDEX_MARKER_NAMESPACE = "__index-markers__"
+# Pinecone's per-request limit for deletes by id.
+DELETE_BATCH_SIZE = 1000
+SEARCH_FIELDS = ["chunk_text", "document_id", "chunk_id", "id", "title", "page"]
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    # itertools.batched (3.12) equivalent: consumes ``items`` lazily, one batch at a time.
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@functools.lru_cache(maxsize=256)
+def _document_filter(document_ids: Tuple[str, ...]) -> Dict[str, Any]:
+    # Shared between calls and threads; never mutated after construction.
+    return {"document_id": {"$in": list(document_ids)}}
 
 
 class VectorStore:
     """Pinecone-backed vector store using integrated cloud embeddings."""
 
+    # (api key, index name) pairs already confirmed or created in this process, so
+    # later instances skip the list_indexes control-plane round trip.
+    _known_indexes: ClassVar[Set[Tuple[str, str]]] = set()
+
     def __init__(self, settings: Settings):
         self.settings = settings
         if not (settings.VECTOR_DB_TYPE == "pinecone" and settings.PINECONE_EMBEDDING_MODEL):
             raise ValueError("Project must be configured for cloud models.")
+        # REST on purpose: the gRPC index client only carries the vector operations, not
+        # the integrated-embedding upsert_records/search calls every hot path here uses.
         self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+        # The data-plane client is built from this config in Index(), so it must be set
+        # first. (pool_threads would only size the unused async_req thread pool.)
+        self.pc.openapi_config.connection_pool_maxsize = settings.PINECONE_CONNECTION_POOL_SIZE
         self.index_name = settings.PINECONE_INDEX_NAME
         self.embedding_model = settings.PINECONE_EMBEDDING_MODEL
         self.index = self._initialize_pinecone_integrated()
+        # Repeated (query, top_k, scope) searches skip the embed + ANN round trip.
+        self._search_cache = QueryCache(settings.SEARCH_CACHE_MAX_SIZE, settings.SEARCH_CACHE_TTL_SECONDS)
+        self._namespace_versions = NamespaceVersions(settings.CACHE_STATE_DIR)
 
     def _initialize_pinecone_integrated(self):
+        index_key = (self.settings.PINECONE_API_KEY, self.index_name)
+        if index_key in self._known_indexes:
+            return self.pc.Index(self.index_name)
         if self.index_name not in self.pc.list_indexes().names():
+            embed: Dict[str, Any] = {
+                "model": self.embedding_model,
+                "field_map": {"text": "chunk_text"},
+                "metric": self.settings.PINECONE_METRIC,
+            }
+            # Integrated indexes do not expose scalar quantization; a smaller output
+            # dimension is the supported way to cut bytes per stored/scanned vector.
+            if self.settings.PINECONE_EMBEDDING_DIMENSION:
+                embed["dimension"] = self.settings.PINECONE_EMBEDDING_DIMENSION
             self.pc.create_index_for_model(
                 name=self.index_name,
                 cloud="aws",
                 region="us-east-1",
-                embed={"model": self.embedding_model, "field_map": {"text": "chunk_text"}},
+                embed=embed,
             )
+        self._known_indexes.add(index_key)
         return self.pc.Index(self.index_name)
 
-    def add_documents(self, chunks: List[Dict[str, Any]]) -> None:
-        if not chunks:
-            return
-        records_to_upsert = []
-        for chunk in chunks:
-            record = chunk.copy()
-            if "id" in record:
-                record["_id"] = record.pop("id")
-            records_to_upsert.append(record)
+    def add_documents(
+        self,
+        chunks: Iterable[Dict[str, Any]],
+        shared_metadata: Optional[Dict[str, Any]] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+    ) -> None:
+        """Upsert ``chunks`` as records; the chunk dicts are turned into records in place.
 
-        for i in range(0, len(records_to_upsert), 96):
-            batch = records_to_upsert[i : i + 96]
-            self.index.upsert_records(namespace="__default__", records=batch)
+        ``chunks`` may be a lazy iterator: batches are uploaded as soon as they fill,
+        so producing later chunks overlaps with the upserts of earlier ones.
+        """
+        # Chunks are built per ingest and never reused, so renaming ``id`` and filling in
+        # the shared fields in place avoids a copy of every chunk. Chunk fields win.
+        shared_items = list((shared_metadata or {}).items())
+        max_in_flight = self.settings.UPSERT_THREADS
+        try:
+            with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+                in_flight: Set[Future] = set()
+                try:
+                    for batch in _batched(chunks, self.settings.UPSERT_BATCH_SIZE):
+                        for chunk in batch:
+                            if "id" in chunk:
+                                chunk["_id"] = chunk.pop("id")
+                            for key, value in shared_items:
+                                chunk.setdefault(key, value)
+                        # Once every worker is busy the producer waits, bounding how
+                        # many prepared batches are held in memory.
+                        if len(in_flight) >= max_in_flight:
+                            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                future.result()
+                        in_flight.add(executor.submit(self._upsert_batch, batch, namespace))
+                    for future in as_completed(in_flight):
+                        future.result()
+                except Exception:
+                    # The first batch to fail (after its own retries) cancels those not
+                    # yet started and is re-raised.
+                    for future in in_flight:
+                        future.cancel()
+                    raise
+        finally:
+            self._invalidate_namespace(namespace)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def _upsert_batch(self, records: List[Dict[str, Any]], namespace: str) -> None:
+        self.index.upsert_records(namespace=namespace, records=records)
 
     def search(
-        self, query: str, top_k: int, document_ids: Optional[List[str]] = None
+        self,
+        query: str,
+        top_k: int,
+        document_ids: Optional[List[str]] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+        min_score: Optional[float] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchResult]:
+        """Return the ``top_k`` hits for ``query``.
+
+        ``document_ids`` is sent as a metadata filter inside the query so Pinecone
+        applies it before ranking; ``search_params`` is forwarded to ``index.search``
+        for per-call tuning such as ``rerank``. Hits scoring below ``min_score`` are dropped.
+        """
+        version = self.cache_version(namespace)
+        cache_key = self._search_cache_key(query, top_k, document_ids, namespace, search_params)
+        search_results = self._search_cache.get(cache_key, version) if version is not None else None
+        if search_results is None:
+            search_results = self._query_index(
+                query, top_k, self._build_filter(document_ids), namespace, search_params
+            )
+            self._cache_results(cache_key, search_results, version)
+        return self._apply_min_score(search_results, min_score)
+
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        document_ids: Optional[List[str]] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+        min_score: Optional[float] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        """Search several queries concurrently, returning hits aligned with ``queries``."""
+        version = self.cache_version(namespace)
+        cache_keys = [
+            self._search_cache_key(query, top_k, document_ids, namespace, search_params)
+            for query in queries
+        ]
+        search_results: List[Optional[List[SearchResult]]] = [
+            self._search_cache.get(cache_key, version) if version is not None else None
+            for cache_key in cache_keys
+        ]
+        misses = [index for index, results in enumerate(search_results) if results is None]
+        if misses:
+            # Cache hits never reach the pool. Integrated-embedding search embeds one
+            # query text per request, so the remaining round trips are overlapped
+            # rather than merged, all sharing one filter object.
+            filter_dict = self._build_filter(document_ids)
+            with ThreadPoolExecutor(
+                max_workers=min(len(misses), self.settings.BATCH_SEARCH_THREADS)
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        self._query_index, queries[index], top_k, filter_dict, namespace, search_params
+                    ): index
+                    for index in misses
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results = future.result()
+                    search_results[index] = results
+                    self._cache_results(cache_keys[index], results, version)
+        return [self._apply_min_score(results or [], min_score) for results in search_results]
+
+    async def asearch(
+        self,
+        query: str,
+        top_k: int,
+        document_ids: Optional[List[str]] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+        min_score: Optional[float] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchResult]:
+        """Awaitable :meth:`search`; the blocking Pinecone call runs in a worker thread."""
+        return await asyncio.to_thread(
+            self.search, query, top_k, document_ids, namespace, min_score, search_params
+        )
+
+    async def asearch_batch(
+        self,
+        queries: List[str],
+        top_k: int,
+        document_ids: Optional[List[str]] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+        min_score: Optional[float] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> List[List[SearchResult]]:
+        """Awaitable :meth:`search_batch`; the blocking Pinecone calls run in worker threads."""
+        return await asyncio.to_thread(
+            self.search_batch, queries, top_k, document_ids, namespace, min_score, search_params
+        )
+
+    def cache_version(self, namespace: str) -> Optional[int]:
+        """Version to cache results from ``namespace`` under, or None when they must not be.
+
+        The version is the namespace's last-write stamp, shared across worker
+        processes. Pinecone serverless is eventually consistent, so nothing is cached
+        within CACHE_WRITE_SETTLE_SECONDS of a write, when hits may still be partial.
+        """
+        written_at = self._namespace_versions.get(namespace)
+        if time.time_ns() - written_at < self.settings.CACHE_WRITE_SETTLE_SECONDS * 1_000_000_000:
+            return None
+        return written_at
+
+    def _cache_results(
+        self, cache_key: Tuple[Any, ...], search_results: List[SearchResult], version: Optional[int]
+    ) -> None:
+        # An empty list may only mean freshly written records are not searchable yet.
+        if search_results and version is not None:
+            self._search_cache.set(cache_key, search_results, version)
+
+    def _search_cache_key(
+        self,
+        query: str,
+        top_k: int,
+        document_ids: Optional[List[str]],
+        namespace: str,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Any, ...]:
+        return (
+            namespace,
+            normalize_query_text(query),
+            top_k,
+            tuple(sorted(document_ids or ())),
+            orjson.dumps(search_params, option=orjson.OPT_SORT_KEYS) if search_params else None,
+        )
+
+    def _build_filter(self, document_ids: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+        # $in is order-insensitive, so every ordering of the same ids shares one filter.
+        return _document_filter(tuple(sorted(document_ids))) if document_ids else None
+
+    def _apply_min_score(
+        self, search_results: List[SearchResult], min_score: Optional[float]
+    ) -> List[SearchResult]:
+        # Cached lists hold every hit, so the threshold is applied after the cache.
+        if min_score is None:
+            return search_results
+        return [result for result in search_results if result.score >= min_score]
+
+    def _query_index(
+        self,
+        query: str,
+        top_k: int,
+        filter_dict: Optional[Dict[str, Any]],
+        namespace: str,
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> List[SearchResult]:
-        filter_dict = {"document_id": {"$in": document_ids}} if document_ids else None
         results = self.index.search(
             query={"inputs": {"text": query}, "top_k": top_k, "filter": filter_dict},
-            fields=["chunk_text", "document_id", "chunk_id", "id", "title", "page"],
-            namespace="__default__",
+            fields=SEARCH_FIELDS,
+            namespace=namespace,
+            **(search_params or {}),
         )
-
-        search_results: List[SearchResult] = []
+        # The SDK decodes the response body itself and exposes no decoder hook, so the
+        # remaining cost is walking the hits: each one's fields are looked up once.
+        search_results = []
         for match in results.get("result", {}).get("hits", []):
-            metadata = match.get("fields", {})
+            fields = match.get("fields", {})
             search_results.append(
-                SearchResult(
-                    content=metadata.get("chunk_text", ""),
-                    metadata=metadata,
-                    score=match.get("_score", 0.0),
-                )
+                SearchResult(content=fields.get("chunk_text", ""), metadata=fields, score=match.get("_score", 0.0))
             )
         return search_results
 
     def delete_documents(self, document_ids: List[str]) -> None:
+        """Delete the default-namespace records of ``document_ids``, by id.
+
+        Ids are those Pinecone lists under each document's ``<document_id>_`` prefix,
+        whichever worker wrote them. The listing trails upserts by a few seconds, so
+        records upserted just before the call may be missed.
+        """
         if not document_ids:
             return
-        self.index.delete(filter={"document_id": {"$in": document_ids}})
+        record_ids = [
+            record_id
+            for document_id in document_ids
+            for record_id in self._list_document_record_ids(document_id)
+        ]
+        for batch in _batched(record_ids, DELETE_BATCH_SIZE):
+            self.index.delete(ids=batch, namespace=DEFAULT_NAMESPACE)
+        self._invalidate_namespace(DEFAULT_NAMESPACE)
+
+    def _list_document_record_ids(self, document_id: str) -> Iterator[str]:
+        # Chunk record ids are "<document_id>_<chunk number>"; the digit check keeps a
+        # document whose id merely starts with this one's from matching.
+        prefix = f"{document_id}_"
+        for page in self.index.list(prefix=prefix, namespace=DEFAULT_NAMESPACE):
+            for record_id in page:
+                if record_id[len(prefix) :].isdigit():
+                    yield record_id
+
+    def warmup(self) -> None:
+        """Open the data-plane connection and wake the hosted embedding model.
+
+        Run once at startup so the first real query does not pay the TLS handshake
+        and serverless cold start. Failures are logged, never raised.
+        """
+        try:
+            self.index.describe_index_stats()
+            # Straight to the index so the throwaway query is not cached.
+            self._query_index("warmup", 1, None, DEFAULT_NAMESPACE)
+        except Exception as e:
+            logger.warning(f"Vector store warmup failed: {e}")
+
+    def mark_namespace_indexed(self, namespace: str) -> None:
+        """Record that every record of ``namespace`` has been upserted; call last."""
+        self._upsert_batch(
+            [{"_id": namespace, "chunk_text": f"index complete: {namespace}"}], INDEX_MARKER_NAMESPACE
+        )
+
+    def is_namespace_indexed(self, namespace: str) -> bool:
+        """Whether ``namespace`` was fully indexed, i.e. :meth:`mark_namespace_indexed` ran.
+
+        Record counts alone cannot tell a finished namespace from one still being
+        filled or left half-filled by a failed run.
+        """
+        return namespace in self.index.fetch(ids=[namespace], namespace=INDEX_MARKER_NAMESPACE).vectors
+
+    def delete_namespace(self, namespace: str) -> None:
+        """Drop every record in ``namespace`` (one server-side operation) and its marker."""
+        self.index.delete(ids=[namespace], namespace=INDEX_MARKER_NAMESPACE)
+        self.index.delete(delete_all=True, namespace=namespace)
+        self._invalidate_namespace(namespace)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Hit/miss/eviction counters of the search result cache."""
+        return self._search_cache.get_stats()
+
+    def _invalidate_namespace(self, namespace: str) -> None:
+        # The bump invalidates other workers' entries; this process drops its own now.
+        self._namespace_versions.bump(namespace)
+        self._search_cache.discard_where(lambda key: key[0] == namespace)
 
@@ -1,4 +1,5 @@
 import os
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch
@@ -25,3 +26,28 @@ def test_app_imports() -> None:
         assert app is not None
         assert app.title == "PolicyMind API"
 
+
+
+def test_worker_startup_configures_logging(tmp_path) -> None:
+    # A fresh interpreter stands in for a spawned uvicorn worker: nothing configured
+    # logging before the app's startup hook runs.
+    script = """
+import asyncio, logging
+from unittest.mock import patch
+with patch("policymind.dependencies.container.build_container"):
+    from policymind import app as app_module
+    with patch.object(app_module, "build_container"):
+        asyncio.run(app_module.app.router.startup())
+logging.getLogger("policymind.worker").info("worker ready")
+"""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(src),
+        "LLM_PROVIDER": "gemini",
+        "GEMINI_API_KEY": "dummy",
+        "PINECONE_API_KEY": "dummy",
+        "LOG_LEVEL": "INFO",
+    }
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, check=True, timeout=120)
+
+    assert "worker ready" in (tmp_path / "app.log").read_text(encoding="utf-8")
@@ -0,0 +1,17 @@
+from policymind.services.cache import QueryCache
+
+
+def test_query_cache_counts_only_size_evictions():
+    cache = QueryCache(max_size=2, ttl_seconds=60)
+    for key in ["a", "b", "c"]:
+        cache.set(key, key.upper())
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 2, "hit_rate": 0.5}
+
+    cache.set("d", "D")
+    cache.clear()
+
+    assert cache.get_stats()["evictions"] == 2
+    assert cache.get_stats()["size"] == 0
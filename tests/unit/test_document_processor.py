@@ -0,0 +1,84 @@
+import random
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock
+
+import pytest
+from policymind.core.config import Settings
+from policymind.services.document_processor import DocumentProcessor
+
+
+def reference_group_sentences(sentences, chunk_size, chunk_overlap):
+    # Sentence-by-sentence packing the chunker must stay equivalent to.
+    chunks, current, current_length = [], [], 0
+    for sentence in sentences:
+        if current_length + len(sentence) > chunk_size and current:
+            chunks.append(" ".join(current))
+            overlap, overlap_len = [], 0
+            for existing in reversed(current):
+                if overlap_len + len(existing) < chunk_overlap:
+                    overlap.insert(0, existing)
+                    overlap_len += len(existing)
+                else:
+                    break
+            current = overlap + [sentence]
+            current_length = overlap_len + len(sentence)
+        else:
+            current.append(sentence)
+            current_length += len(sentence)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def make_processor(chunk_size, chunk_overlap):
+    settings = MagicMock()
+    settings.CHUNK_SIZE = chunk_size
+    settings.CHUNK_OVERLAP = chunk_overlap
+    settings.OCR_WORKERS = 2
+    return DocumentProcessor(settings)
+
+
+def test_group_sentences_packs_with_overlap():
+    processor = make_processor(chunk_size=10, chunk_overlap=5)
+
+    assert list(processor._group_sentences(["aaaa", "bbbb", "cccc", "dd"])) == ["aaaa bbbb", "bbbb cccc dd"]
+    assert list(processor._group_sentences([])) == []
+
+
+@pytest.mark.parametrize("chunk_size,chunk_overlap", [(1000, 200), (50, 20), (30, 0), (10, 40)])
+def test_group_sentences_matches_reference(chunk_size, chunk_overlap):
+    rng = random.Random(chunk_size * 31 + chunk_overlap)
+    processor = make_processor(chunk_size, chunk_overlap)
+    for _ in range(50):
+        sentences = ["x" * rng.randint(1, 120) for _ in range(rng.randint(1, 60))]
+        expected = reference_group_sentences(sentences, chunk_size, chunk_overlap)
+        assert list(processor._group_sentences(sentences)) == expected
+
+
+def test_ocr_replaces_broken_process_pool():
+    processor = make_processor(chunk_size=1000, chunk_overlap=200)
+    processor.close()
+    broken, healthy = MagicMock(), MagicMock()
+    broken.map.side_effect = BrokenProcessPool()
+    healthy.map.return_value = iter([["page one"]])
+    processor._ocr_pool = broken
+    processor._new_ocr_pool = MagicMock(return_value=healthy)
+
+    assert processor._ocr_pages("scan.pdf", 1) == ["page one"]
+    broken.shutdown.assert_called_once_with(wait=False)
+    assert processor._ocr_pool is healthy
+
+
+def test_ocr_pool_uses_every_cpu_by_default(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 4)
+    monkeypatch.delenv("OCR_WORKERS", raising=False)
+    monkeypatch.delenv("API_WORKERS", raising=False)
+    monkeypatch.setenv("LLM_PROVIDER", "gemini")
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("PINECONE_API_KEY", "test-key")
+
+    processor = DocumentProcessor(Settings())
+    processor.close()
+
+    assert processor._ocr_workers == 4
+    assert processor._ocr_pool._max_workers == 4
@@ -8,15 +8,20 @@ from policymind.models.schemas import QueryRequest, SearchResult, ClauseInfo
 def mock_settings():
     settings = MagicMock()
     settings.SIMILARITY_THRESHOLD = 0.7
+    settings.QUERY_CACHE_MAX_SIZE = 100
+    settings.QUERY_CACHE_TTL_SECONDS = 60
+    settings.LLM_MAX_CONCURRENCY = 4
     return settings
 
 
 @pytest.fixture
 def mock_vector_store():
     store = MagicMock()
-    store.search.return_value = [
+    store.asearch = AsyncMock(return_value=[
         SearchResult(content="Policy covers fire damage.", score=0.85, metadata={}),
-    ]
+    ])
+    store.asearch_batch = AsyncMock()
+    store.cache_version.return_value = 0
     return store
 
 
@@ -45,7 +50,6 @@ async def test_process_query_success(mock_settings, mock_vector_store, mock_llm_
         document_id="doc1",
         relevance_score=0.9
     )])
-    engine._extract_intent_and_entities = MagicMock(return_value=("Information Retrieval", {}))
 
     request = QueryRequest(question="Is fire damage covered?", max_results=3, include_logic=True)
     
@@ -56,3 +60,55 @@ async def test_process_query_success(mock_settings, mock_vector_store, mock_llm_
     assert response.logic_tree is not None
     assert response.logic_tree.type == "AND"
 
+
+
+@pytest.mark.asyncio
+async def test_process_query_serves_repeated_question_from_cache(mock_settings, mock_vector_store, mock_llm_provider):
+    engine = QueryEngine(settings=mock_settings, vector_store=mock_vector_store, llm_provider=mock_llm_provider)
+
+    request = QueryRequest(question="Is fire damage covered?", max_results=3, include_logic=False)
+    first = await engine.process_query(request)
+    second = await engine.process_query(QueryRequest(question="  is FIRE damage covered?", max_results=3, include_logic=False))
+    third = await engine.process_query(QueryRequest(question="Is fire damage\n covered?", max_results=3, include_logic=False))
+
+    assert second == first
+    assert third == first
+    assert mock_vector_store.asearch.await_count == 1
+    assert mock_llm_provider.generate_response.await_count == 1
+    assert engine.stats()["answer_hit_rate"] == 2 / 3
+
+    # Punctuation can change the meaning ("10/20" vs "10-20"), so it is part of the key.
+    await engine.process_query(QueryRequest(question="Is fire-damage covered?", max_results=3, include_logic=False))
+    assert mock_vector_store.asearch.await_count == 2
+
+    # A write to the namespace bumps its version, which retires the cached answer.
+    mock_vector_store.cache_version.return_value = 1
+    await engine.process_query(request)
+    assert mock_vector_store.asearch.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_process_queries_batches_search_and_llm_calls(mock_settings, mock_vector_store, mock_llm_provider):
+    mock_vector_store.asearch_batch.return_value = [
+        [SearchResult(content="Policy covers fire damage.", score=0.85, metadata={"id": "c1"})],
+        [SearchResult(content="Floods are excluded.", score=0.9, metadata={"id": "c2"})],
+    ]
+    mock_llm_provider.generate_structured_response.return_value = {
+        "answers": [
+            {"q": 2, "a": "No, floods are excluded.", "confidence": 0.8},
+            {"q": 1, "a": "Yes, fire damage is covered.", "confidence": 0.9},
+        ]
+    }
+    engine = QueryEngine(settings=mock_settings, vector_store=mock_vector_store, llm_provider=mock_llm_provider)
+
+    responses = await engine.process_queries([
+        QueryRequest(question="Is fire damage covered?", document_ids=["doc1"], include_logic=False),
+        QueryRequest(question="Are floods covered?", document_ids=["doc1"], include_logic=False),
+    ])
+
+    assert [response.answer for response in responses] == ["Yes, fire damage is covered.", "No, floods are excluded."]
+    assert [response.confidence for response in responses] == [0.9, 0.8]
+    mock_vector_store.asearch.assert_not_awaited()
+    assert mock_vector_store.asearch_batch.await_count == 1
+    assert mock_llm_provider.generate_structured_response.await_count == 1
+    mock_llm_provider.generate_response.assert_not_awaited()
@@ -0,0 +1,103 @@
+import os
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+from policymind.api.routes import get_container, index_submission_document, router, verify_hackrx_token
+from policymind.models.schemas import QueryResponse
+
+
+@pytest.fixture
+def mock_container():
+    container = MagicMock()
+    container.settings.HACKRX_TOKEN = "expected-token"
+    return container
+
+
+def test_verify_hackrx_token_accepts_matching_token(mock_container):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="expected-token")
+
+    assert verify_hackrx_token(credentials=credentials, container=mock_container) is None
+
+
+@pytest.mark.parametrize("credentials", [
+    None,
+    HTTPAuthorizationCredentials(scheme="Bearer", credentials="wrong-token"),
+])
+def test_verify_hackrx_token_rejects_missing_or_wrong_token(mock_container, credentials):
+    with pytest.raises(HTTPException) as exc_info:
+        verify_hackrx_token(credentials=credentials, container=mock_container)
+
+    assert exc_info.value.status_code == 401
+
+
+def test_index_submission_document_marks_namespace_only_when_complete(mock_container):
+    mock_container.vector_store.is_namespace_indexed.return_value = False
+    mock_container.document_processor.process_document.return_value = {"chunks": [], "shared_metadata": {}}
+
+    index_submission_document("doc.pdf", "hackathon-abc", mock_container)
+
+    mock_container.vector_store.add_documents.assert_called_once_with([], {}, namespace="hackathon-abc")
+    mock_container.vector_store.mark_namespace_indexed.assert_called_once_with("hackathon-abc")
+
+
+def test_index_submission_document_leaves_failed_namespace_unmarked(mock_container):
+    mock_container.vector_store.is_namespace_indexed.return_value = False
+    mock_container.document_processor.process_document.return_value = {"chunks": [], "shared_metadata": {}}
+    mock_container.vector_store.add_documents.side_effect = RuntimeError("upsert failed")
+
+    with pytest.raises(RuntimeError):
+        index_submission_document("doc.pdf", "hackathon-abc", mock_container)
+
+    mock_container.vector_store.mark_namespace_indexed.assert_not_called()
+    mock_container.vector_store.delete_namespace.assert_not_called()
+
+
+def test_index_submission_document_skips_namespace_indexed_meanwhile(mock_container):
+    mock_container.vector_store.is_namespace_indexed.return_value = True
+
+    index_submission_document("doc.pdf", "hackathon-abc", mock_container)
+
+    mock_container.document_processor.process_document.assert_not_called()
+
+
+def test_run_submission_indexes_once_then_reuses_marked_namespace(mock_container, tmp_path):
+    marked = set()
+    temp_files_seen = []
+    mock_container.settings.UPLOAD_DIR = str(tmp_path)
+    mock_container.http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"%PDF-1.4 policy"))
+    )
+    mock_container.vector_store.is_namespace_indexed.side_effect = lambda namespace: namespace in marked
+    mock_container.vector_store.mark_namespace_indexed.side_effect = marked.add
+
+    def process_document(file_path, namespace):
+        temp_files_seen.append(os.path.exists(file_path))
+        return {"chunks": [], "shared_metadata": {}}
+
+    mock_container.document_processor.process_document.side_effect = process_document
+    mock_container.query_engine.process_queries = AsyncMock(
+        return_value=[QueryResponse(answer="Yes.", clauses_used=[], confidence=0.9)]
+    )
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_container] = lambda: mock_container
+    client = TestClient(app)
+    submission = {"documents": "https://example.com/policy.pdf", "questions": ["Is fire damage covered?"]}
+    headers = {"Authorization": "Bearer expected-token"}
+
+    first = client.post("/hackrx/run", json=submission, headers=headers)
+    second = client.post("/hackrx/run", json=submission, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == {"answers": ["Yes."]}
+    assert temp_files_seen == [True]
+    mock_container.vector_store.add_documents.assert_called_once()
+    (namespace,) = marked
+    assert namespace.startswith("hackathon-")
+    for call in mock_container.query_engine.process_queries.await_args_list:
+        assert call.kwargs["namespace"] == namespace
+    assert list(tmp_path.iterdir()) == []
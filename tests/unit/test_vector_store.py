@@ -0,0 +1,178 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from policymind.services.vector_store import VectorStore
+
+
+@pytest.fixture
+def mock_settings(tmp_path):
+    settings = MagicMock()
+    settings.VECTOR_DB_TYPE = "pinecone"
+    settings.PINECONE_EMBEDDING_MODEL = "llama-text-embed-v2"
+    settings.PINECONE_EMBEDDING_DIMENSION = None
+    settings.UPSERT_BATCH_SIZE = 2
+    settings.UPSERT_THREADS = 2
+    settings.SEARCH_CACHE_MAX_SIZE = 16
+    settings.SEARCH_CACHE_TTL_SECONDS = 60
+    settings.BATCH_SEARCH_THREADS = 2
+    settings.CACHE_STATE_DIR = str(tmp_path / "cache-state")
+    settings.CACHE_WRITE_SETTLE_SECONDS = 10
+    return settings
+
+
+@pytest.fixture
+def vector_store(mock_settings):
+    with patch("policymind.services.vector_store.Pinecone"):
+        yield VectorStore(mock_settings)
+
+
+def test_client_connection_pool_is_sized_before_the_index_client_is_built(mock_settings):
+    mock_settings.PINECONE_CONNECTION_POOL_SIZE = 16
+    with patch("policymind.services.vector_store.Pinecone") as pinecone_cls:
+        pinecone_cls.return_value.Index.side_effect = lambda name: pinecone_cls.return_value.openapi_config.connection_pool_maxsize
+        store = VectorStore(mock_settings)
+
+    assert store.index == 16
+
+
+def test_index_existence_is_checked_once_per_process(mock_settings):
+    with patch("policymind.services.vector_store.Pinecone") as pinecone_cls:
+        VectorStore(mock_settings)
+        VectorStore(mock_settings)
+
+    assert pinecone_cls.return_value.list_indexes.call_count == 1
+
+
+def test_add_documents_upserts_every_record_in_batches(vector_store):
+    chunks = ({"id": f"doc1_{i}", "chunk_text": f"text {i}", "chunk_id": i} for i in range(5))
+
+    vector_store.add_documents(chunks, {"document_id": "doc1"}, namespace="ns")
+
+    calls = vector_store.index.upsert_records.call_args_list
+    assert sorted(len(call.kwargs["records"]) for call in calls) == [1, 2, 2]
+    records = sorted((record for call in calls for record in call.kwargs["records"]), key=lambda r: r["_id"])
+    assert [record["_id"] for record in records] == [f"doc1_{i}" for i in range(5)]
+    assert all(record["document_id"] == "doc1" and "id" not in record for record in records)
+    assert {call.kwargs["namespace"] for call in calls} == {"ns"}
+
+
+def test_search_is_cached_until_namespace_changes(vector_store):
+    vector_store.index.search.return_value = {
+        "result": {"hits": [{"_score": 0.9, "fields": {"chunk_text": "Covered.", "document_id": "doc1"}}]}
+    }
+
+    first = vector_store.search("What is covered?", top_k=3, namespace="ns")
+    second = vector_store.search("  what is COVERED? ", top_k=3, namespace="ns")
+
+    assert second is first
+    assert vector_store.index.search.call_count == 1
+    assert vector_store.get_stats()["hits"] == 1
+
+    vector_store.add_documents([{"id": "doc2_0", "chunk_text": "New.", "chunk_id": 0}], namespace="ns")
+    vector_store.search("What is covered?", top_k=3, namespace="ns")
+
+    assert vector_store.index.search.call_count == 2
+
+
+def test_search_does_not_cache_empty_results(vector_store):
+    vector_store.index.search.return_value = {"result": {"hits": []}}
+
+    vector_store.search("What is covered?", top_k=3)
+    vector_store.search("What is covered?", top_k=3)
+
+    assert vector_store.index.search.call_count == 2
+
+
+def test_search_cache_is_invalidated_by_writes_from_other_workers(mock_settings):
+    mock_settings.CACHE_WRITE_SETTLE_SECONDS = 0
+    with patch("policymind.services.vector_store.Pinecone"):
+        store, other_worker = VectorStore(mock_settings), VectorStore(mock_settings)
+    store.index.search.return_value = {"result": {"hits": [{"_score": 0.9, "fields": {"chunk_text": "Old."}}]}}
+
+    store.search("What is covered?", top_k=3, namespace="ns")
+    other_worker.delete_namespace("ns")
+    store.search("What is covered?", top_k=3, namespace="ns")
+
+    assert store.index.search.call_count == 2
+
+
+def test_search_batch_only_dispatches_cache_misses(vector_store):
+    vector_store.index.search.side_effect = lambda query, **kwargs: {
+        "result": {"hits": [{"_score": 0.8, "fields": {"chunk_text": query["inputs"]["text"]}}]}
+    }
+    vector_store.search("first question", top_k=3, document_ids=["doc1"])
+
+    results = vector_store.search_batch(
+        ["first question", "second question", "third question"], top_k=3, document_ids=["doc1"]
+    )
+
+    assert [hits[0].content for hits in results] == ["first question", "second question", "third question"]
+    assert vector_store.index.search.call_count == 3
+    filters = [call.kwargs["query"]["filter"] for call in vector_store.index.search.call_args_list[1:]]
+    assert filters[0] is filters[1] == {"document_id": {"$in": ["doc1"]}}
+
+
+def test_search_forwards_search_params_and_applies_min_score(vector_store):
+    vector_store.index.search.return_value = {
+        "result": {
+            "hits": [
+                {"_score": 0.9, "fields": {"chunk_text": "Strong."}},
+                {"_score": 0.2, "fields": {"chunk_text": "Weak."}},
+            ]
+        }
+    }
+    rerank = {"model": "bge-reranker-v2-m3", "top_n": 2, "rank_fields": ["chunk_text"]}
+
+    results = vector_store.search(
+        "What is covered?", top_k=5, min_score=0.5, search_params={"rerank": rerank}
+    )
+
+    assert [result.content for result in results] == ["Strong."]
+    assert vector_store.index.search.call_args.kwargs["rerank"] == rerank
+    assert len(vector_store.search("What is covered?", top_k=5, search_params={"rerank": rerank})) == 2
+    assert vector_store.index.search.call_count == 1
+
+
+def test_delete_documents_deletes_listed_ids(vector_store):
+    listed = {
+        "doc1_": [["doc1_1", "doc1_2"]],
+        "doc2_": [["doc2_0", "doc2_extra_0"]],
+    }
+    vector_store.index.list.side_effect = lambda prefix, namespace: iter(listed[prefix])
+
+    vector_store.delete_documents(["doc1", "doc2"])
+
+    vector_store.index.delete.assert_called_once_with(
+        ids=["doc1_1", "doc1_2", "doc2_0"], namespace="__default__"
+    )
+
+
+def test_search_reuses_filter_for_the_same_document_scope(vector_store):
+    vector_store.index.search.return_value = {"result": {"hits": []}}
+
+    vector_store.search("first question", top_k=3, document_ids=["doc2", "doc1"])
+    vector_store.search("second question", top_k=3, document_ids=["doc1", "doc2"])
+
+    first, second = (call.kwargs["query"]["filter"] for call in vector_store.index.search.call_args_list)
+    assert first is second == {"document_id": {"$in": ["doc1", "doc2"]}}
+
+
+def test_warmup_does_not_raise_or_cache(vector_store):
+    vector_store.index.search.side_effect = RuntimeError("cold start timeout")
+
+    vector_store.warmup()
+
+    vector_store.index.describe_index_stats.assert_called_once()
+    assert vector_store.get_stats()["size"] == 0
+
+
+def test_namespace_counts_as_indexed_only_once_marked(vector_store):
+    vector_store.index.fetch.return_value.vectors = {}
+    assert not vector_store.is_namespace_indexed("hackathon-abc")
+
+    vector_store.mark_namespace_indexed("hackathon-abc")
+
+    records = vector_store.index.upsert_records.call_args.kwargs["records"]
+    assert [record["_id"] for record in records] == ["hackathon-abc"]
+    assert vector_store.index.upsert_records.call_args.kwargs["namespace"] == "__index-markers__"
+    vector_store.index.fetch.return_value.vectors = {"hackathon-abc": MagicMock()}
+    assert vector_store.is_namespace_indexed("hackathon-abc")